@@ -13,6 +13,12 @@
 
 import sys
 import os
+import re
+import collections
+import functools
+import html
+import threading
+import time
 import warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
@@ -22,10 +28,13 @@ import numpy as np
 import geopandas as gpd
 
 import matplotlib.pyplot as plt
+from matplotlib.artist import Artist
+from matplotlib.image import AxesImage
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 
 import cartopy.crs as ccrs
+import cartopy.feature as cfeature
 from cartopy.mpl.geoaxes import GeoAxes
 
 import qtawesome as qta
@@ -33,15 +42,287 @@ import qtawesome as qta
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QTextEdit, QPushButton, QVBoxLayout,
                              QWidget, QFileDialog, QHBoxLayout, QSplitter, QListWidget,
                              QTabWidget, QMessageBox, QListWidgetItem, QLabel, QDialog,
-                             QFormLayout, QDialogButtonBox, QComboBox, QAction, QWidgetAction)
+                             QFormLayout, QDialogButtonBox, QComboBox, QSpinBox, QAction, QWidgetAction)
 from PyQt5.QtGui import QTextCursor, QTextCharFormat, QColor, QFont
-from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtCore import Qt, QSize, QThread, QSettings, QTimer, pyqtSignal
 
 
 # --- Matplotlib and Cartopy Global Configuration ---
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Arial']
 plt.rcParams['axes.unicode_minus'] = False
 
+
+class CachedExtentFeature(cfeature.Feature):
+    """
+    Wraps a Cartopy feature and memoizes its in-view geometry lookup.
+
+    Cartopy already caches the geometries read from disk and their projected paths, but
+    every draw still tests each geometry against the view extent. The extent is widened
+    to whole degrees and used as the cache key, so redraws of the same view (and small
+    pans) reuse the previous lookup; the extra geometries are clipped by the axes.
+    """
+    def __init__(self, feature, maxsize=8):
+        super().__init__(feature.crs, **feature.kwargs)
+        self._feature = feature
+        self._lookup = functools.lru_cache(maxsize=maxsize)(self._intersecting)
+
+    @property
+    def crs(self):
+        return self._feature.crs
+
+    def geometries(self):
+        return self._feature.geometries()
+
+    def intersecting_geometries(self, extent):
+        if extent is None or np.isnan(extent[0]):
+            return self._feature.intersecting_geometries(extent)
+        x0, x1, y0, y1 = extent
+        key = (int(np.floor(x0)), int(np.ceil(x1)), int(np.floor(y0)), int(np.ceil(y1)))
+        return iter(self._lookup(key))
+
+    def _intersecting(self, extent_key):
+        return tuple(self._feature.intersecting_geometries(extent_key))
+
+
+# Projections and features shared by all plots instead of being rebuilt for every draw
+_PLATE_CARREE = ccrs.PlateCarree()
+_MERCATOR = ccrs.Mercator()
+_COASTLINES = CachedExtentFeature(cfeature.COASTLINE)  # adaptive scale, same as ax.coastlines()
+_CRS_CACHE = {}
+
+# Latitude range of ccrs.Mercator() (its default min/max_latitude); it diverges beyond.
+MERCATOR_LATITUDES = (-80.0, 84.0)
+# Navigation sub-cubes smaller than this are read into memory in one go.
+NAV_CUBE_MAX_BYTES = 512 * 1024 * 1024
+# Names of longitude/latitude dimensions and coordinate variables
+LON_NAME_RE = re.compile(r'lon(gitude)?|^x$', re.IGNORECASE)
+LAT_NAME_RE = re.compile(r'lat(itude)?|^y$', re.IGNORECASE)
+# CF units of longitude coordinates (degrees_east, degree_E, degreesE, ...)
+LON_UNITS_RE = re.compile(r'^degrees?_?e(ast)?$', re.IGNORECASE)
+# Dimensions up to this size get a drop-down index list, larger ones a spin box.
+INDEX_COMBO_MAX_ITEMS = 50
+# Number of recently opened files kept in the history.
+HISTORY_MAX_ENTRIES = 200
+# Identical non-fatal errors reported within this many seconds are shown only once.
+ERROR_REPEAT_INTERVAL = 0.5
+# Coordinates off a regular grid by less than this fraction of a cell (e.g. float32 rounding)
+# are drawn as one image.
+GRID_TOLERANCE = 1e-3
+# Default per-variable libnetcdf chunk cache; override via the "netcdf/chunk_cache_mb" setting.
+NC_CHUNK_CACHE_MB = 64
+
+def epsg_crs(epsg):
+    """Returns the Cartopy CRS for an EPSG code, building each one only once."""
+    if epsg not in _CRS_CACHE:
+        _CRS_CACHE[epsg] = ccrs.epsg(epsg)
+    return _CRS_CACHE[epsg]
+
+def as_display_array(data):
+    """
+    Converts a field read from netCDF4 to a plain float32 array with masked cells as NaN.
+
+    Display needs far less than float64 precision; values shown on hover and the colour
+    range stay correct to ~1e-6 relative while half the bytes are moved, and nothing
+    downstream has to handle masked arrays.
+    """
+    if np.ma.is_masked(data):
+        return data.astype(np.float32, copy=False).filled(np.nan)
+    return np.asarray(np.ma.getdata(data), dtype=np.float32)
+
+def squeeze_index(shape):
+    """Index that reads a variable with its singleton dimensions dropped, like np.squeeze(var[:])."""
+    return tuple(slice(None) if size > 1 else 0 for size in shape)
+
+def read_coordinate(coord):
+    """Reads a coordinate variable; beyond 2D (e.g. lon(time, y, x)) only its singleton-squeezed slab."""
+    return coord[squeeze_index(coord.shape)] if coord.ndim > 2 else coord[:]
+
+def is_regular_grid(x, y):
+    """Returns True if both coordinate arrays are 1D, strictly monotonic and evenly spaced."""
+    for coords in (x, y):
+        if coords is None or np.ndim(coords) != 1 or len(coords) < 2 or np.ma.is_masked(coords):
+            return False
+        # float64 steps: float32 coordinates are only accurate to ~1e-5 deg near +-180
+        steps = np.diff(np.asarray(coords, dtype=np.float64))
+        if not (np.all(steps > 0) or np.all(steps < 0)):
+            return False
+        dx = (float(coords[-1]) - float(coords[0])) / (len(coords) - 1)
+        if np.max(np.abs(steps - dx)) > GRID_TOLERANCE * abs(dx):
+            return False
+    return True
+
+def is_longitude(coord):
+    """True if a coordinate variable holds longitudes: by its units, or by its name if it has none."""
+    units = getattr(coord, 'units', None)
+    if units is not None:
+        return bool(LON_UNITS_RE.match(str(units).strip()))
+    return bool(LON_NAME_RE.search(coord.name))
+
+def wrap_longitudes(x):
+    """
+    Moves a 1D 0-360 longitude axis into -180..180.
+
+    Returns:
+        (x, shift): the wrapped axis, ascending like the input, and the np.roll shift that
+        puts the columns of a field into the same order (0 when no roll is needed).
+    """
+    if np.ndim(x) != 1 or len(x) < 2 or np.ma.is_masked(x) or float(x[-1]) <= 180:
+        return x, 0
+    x = np.asarray(x)
+    if not np.all(np.diff(x) > 0):
+        return x, 0
+    if float(x[0]) > 180:
+        return x - 360, 0  # regional grid entirely east of the dateline
+    dx = (float(x[-1]) - float(x[0])) / (len(x) - 1)
+    if abs(float(x[0]) + 360 - float(x[-1]) - dx) > GRID_TOLERANCE * dx:
+        return x, 0  # not a full circle: rolling would leave a gap, pcolormesh wraps it instead
+    split = int(np.searchsorted(x, 180))
+    return np.concatenate([x[split:] - 360, x[:split]]), len(x) - split
+
+def separable_axes(x, y):
+    """
+    Returns the 1D axes of 2D coordinates that are just a meshgrid of them, else (x, y).
+
+    Lets draw_field treat such files like 1D grids instead of drawing a curvilinear mesh.
+    """
+    if np.ndim(x) != 2 or np.shape(x) != np.shape(y) or min(np.shape(x)) < 2:
+        return x, y
+    if np.ma.is_masked(x) or np.ma.is_masked(y):
+        return x, y
+    x, y = np.ma.getdata(x), np.ma.getdata(y)
+    x_axis, y_axis = x[0, :], y[:, 0]
+    x_tol = GRID_TOLERANCE * np.abs(np.diff(x_axis.astype(np.float64))).min(initial=np.inf)
+    y_tol = GRID_TOLERANCE * np.abs(np.diff(y_axis.astype(np.float64))).min(initial=np.inf)
+    if (np.abs(x - x_axis[np.newaxis, :]).max() <= x_tol and
+            np.abs(y - y_axis[:, np.newaxis]).max() <= y_tol):
+        return x_axis, y_axis
+    return x, y
+
+def decimate(data, x, y, stride_y, stride_x):
+    """
+    Reduces a 2D field and its coordinates by (stride_y, stride_x) cells for display.
+
+    Floating fields are block-averaged (ignoring NaN and masked cells) so thin features
+    don't alias away, with each block placed at its centre cell; other dtypes are strided.
+    A partial block at the far edges is dropped, which is under a pixel at display strides.
+    """
+    if stride_y == 1 and stride_x == 1:
+        return data, x, y
+    if np.issubdtype(data.dtype, np.floating):
+        ny, nx = data.shape[0] // stride_y, data.shape[1] // stride_x
+        blocks = data[:ny * stride_y, :nx * stride_x].reshape(ny, stride_y, nx, stride_x)
+        if np.ma.isMaskedArray(blocks):
+            reduced = blocks.mean(axis=(1, 3))
+        else:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN blocks stay NaN
+                reduced = np.nanmean(blocks, axis=(1, 3))
+        data = reduced.astype(data.dtype, copy=False)
+        start_y, start_x = stride_y // 2, stride_x // 2
+    else:
+        data = data[::stride_y, ::stride_x]
+        start_y, start_x = 0, 0
+    ny, nx = data.shape
+    if np.ndim(x) == 1:
+        x, y = x[start_x::stride_x][:nx], y[start_y::stride_y][:ny]
+    else:
+        x = x[start_y::stride_y, start_x::stride_x][:ny, :nx]
+        y = y[start_y::stride_y, start_x::stride_x][:ny, :nx]
+    return data, x, y
+
+def visible_window(x, y, xlim, ylim):
+    """
+    Returns (row0, row1, col0, col1), the index ranges of the cells of a (y, x) field that
+    lie within the view limits, with one cell to spare, or None if no cell is in view.
+    """
+    (x0, x1), (y0, y1) = sorted(xlim), sorted(ylim)
+    if np.ndim(x) == 1:
+        in_x = np.ma.filled((x >= x0) & (x <= x1), False)
+        in_y = np.ma.filled((y >= y0) & (y <= y1), False)
+    else:
+        inside = np.ma.filled((x >= x0) & (x <= x1) & (y >= y0) & (y <= y1), False)
+        in_x, in_y = inside.any(axis=0), inside.any(axis=1)
+    cols, rows = np.flatnonzero(in_x), np.flatnonzero(in_y)
+    if not len(cols) or not len(rows):
+        return None
+    return (max(int(rows[0]) - 1, 0), min(int(rows[-1]) + 2, len(in_y)),
+            max(int(cols[0]) - 1, 0), min(int(cols[-1]) + 2, len(in_x)))
+
+def nearest_sorted_index(sorted_coords, value):
+    """Returns the index of the element of the ascending array `sorted_coords` closest to `value`."""
+    idx = min(int(np.searchsorted(sorted_coords, value)), len(sorted_coords) - 1)
+    if idx > 0 and sorted_coords[idx] - value > value - sorted_coords[idx - 1]:
+        idx -= 1
+    return idx
+
+def lookup_value(x_sorted, x_order, y_sorted, y_order, values, mask, x, y):
+    """
+    Finds the cell nearest to (x, y) for the hover readout.
+
+    Returns:
+        (row, col, value, is_masked); row and col are -1 when the cell is outside `values`.
+    """
+    col = x_order[nearest_sorted_index(x_sorted, x)]
+    row = y_order[nearest_sorted_index(y_sorted, y)]
+    if row >= values.shape[0] or col >= values.shape[1]:
+        return -1, -1, 0.0, True
+    value = float(values[row, col])
+    return row, col, value, mask[row, col] or np.isnan(value)
+
+def ascending_view(data, x, y):
+    """Flips views of a (y, x) field and its 1D coordinates so both axes are ascending."""
+    if x[0] > x[-1]:
+        data, x = data[:, ::-1], x[::-1]
+    if y[0] > y[-1]:
+        data, y = data[::-1, :], y[::-1]
+    return data, x, y
+
+# Default stylesheet of the text panel; its classes match the categories of
+# GeospatialTool.append_formatted_text and are parsed once instead of per line
+TEXT_STYLESHEET = """
+.title { font-size:15pt; font-weight:bold; color:#0078d7; }
+.header { font-size:12pt; font-weight:bold; color:#333333; }
+.bold { font-weight:bold; }
+.italic { font-style:italic; color:gray; }
+"""
+
+def html_line(text, style=None):
+    """Formats one line of panel text as HTML, for batching many lines into one insert."""
+    body = html.escape(text).replace("\n", "<br>")
+    if style is None:
+        return f'<span>{body}</span><br>'
+    return f'<span class="{style}">{body}</span><br>'
+
+def tune_chunk_cache(dataset, cache_mb):
+    """Enlarges the chunk cache of chunked variables so slicing doesn't re-decompress chunks."""
+    for var in dataset.variables.values():
+        try:
+            if var.chunking() != 'contiguous':
+                var.set_var_chunk_cache(size=cache_mb * 1024 * 1024, nelems=521, preemption=0.75)
+        except Exception as e:
+            print(f"Warning: Could not set chunk cache for '{var.name}'. {e}")
+
+def collect_nc_metadata(dataset):
+    """
+    Walks a dataset once and returns its metadata as plain Python objects.
+
+    Returns:
+        dict with 'attrs' [(name, value)], 'dimensions' [(name, size)] and 'variables'
+        [(name, dims, shape, dtype, chunking, [(attr, value)])], in file order.
+    """
+    return {
+        'attrs': [(name, getattr(dataset, name)) for name in dataset.ncattrs()],
+        'dimensions': [(name, len(dim)) for name, dim in dataset.dimensions.items()],
+        'variables': [(name, var.dimensions, var.shape, var.dtype, var.chunking(),
+                       [(attr, getattr(var, attr)) for attr in var.ncattrs()])
+                      for name, var in dataset.variables.items()],
+    }
+
+@functools.lru_cache(maxsize=None)
+def cached_icon(name, color):
+    """Returns a shared qtawesome icon; needs a QApplication, so icons are created on first use."""
+    return qta.icon(name, color=color)
+
 # --- Modern UI Stylesheet (QSS) ---
 def load_stylesheet(filename="style.qss"):
     try:
@@ -54,24 +335,24 @@ def load_stylesheet(filename="style.qss"):
         return ""
 
 class DimensionSelectorDialog(QDialog):
-    # This class is unchanged from V3.5
-    def __init__(self, var, parent=None):
+    def __init__(self, dimensions, shape, parent=None):
         super().__init__(parent)
         self.setWindowTitle("选择维度、坐标轴和导航轴")
-        self.var = var
-        self.dimensions = var.dimensions
-        self.shape = var.shape
+        self.dimensions = dimensions
+        self.shape = shape
 
         layout = QFormLayout(self)
         self.index_selectors = {}
         for dim, size in zip(self.dimensions, self.shape):
-            combo = QComboBox()
-            if size > 1000:
-                 combo.addItems([str(i) for i in range(10)] + [f"... ({size-1})"])
+            if size <= INDEX_COMBO_MAX_ITEMS:
+                selector = QComboBox()
+                selector.addItems([str(i) for i in range(size)])
             else:
-                 combo.addItems([str(i) for i in range(size)])
-            self.index_selectors[dim] = combo
-            layout.addRow(f"{dim} 索引 (大小: {size})", combo)
+                # A spin box costs the same for any dimension size, unlike one combo item per index
+                selector = QSpinBox()
+                selector.setRange(0, size - 1)
+            self.index_selectors[dim] = selector
+            layout.addRow(f"{dim} 索引 (大小: {size})", selector)
 
         self.x_axis_combo = QComboBox()
         self.y_axis_combo = QComboBox()
@@ -85,10 +366,12 @@ class DimensionSelectorDialog(QDialog):
         if lon_dims: self.x_axis_combo.setCurrentText(lon_dims[0])
         if lat_dims: self.y_axis_combo.setCurrentText(lat_dims[0])
         
+        self._nav_pair = None  # (x, y) the navigation choices were last built for
+        self._nav_update_pending = False
         self.update_nav_combo()
 
-        self.x_axis_combo.currentTextChanged.connect(self.update_nav_combo)
-        self.y_axis_combo.currentTextChanged.connect(self.update_nav_combo)
+        self.x_axis_combo.currentTextChanged.connect(self.schedule_nav_update)
+        self.y_axis_combo.currentTextChanged.connect(self.schedule_nav_update)
 
         layout.addRow("X 轴 (经度)", self.x_axis_combo)
         layout.addRow("Y 轴 (纬度)", self.y_axis_combo)
@@ -99,15 +382,35 @@ class DimensionSelectorDialog(QDialog):
         self.button_box.rejected.connect(self.reject)
         layout.addWidget(self.button_box)
 
+    def schedule_nav_update(self):
+        """Coalesces changes of both axis combos in one event loop pass into a single rebuild."""
+        if not self._nav_update_pending:
+            self._nav_update_pending = True
+            QTimer.singleShot(0, self.update_nav_combo)
+
     def update_nav_combo(self):
-        self.nav_axis_combo.clear()
+        self._nav_update_pending = False
         x_dim = self.x_axis_combo.currentText()
         y_dim = self.y_axis_combo.currentText()
+        if (x_dim, y_dim) == self._nav_pair:
+            return
+        self._nav_pair = (x_dim, y_dim)
         nav_dims = [dim for dim in self.dimensions if dim not in [x_dim, y_dim]]
-        self.nav_axis_combo.addItems(["无"] + nav_dims)
+        self.nav_axis_combo.blockSignals(True)
+        try:
+            self.nav_axis_combo.clear()
+            self.nav_axis_combo.addItems(["无"] + nav_dims)
+        finally:
+            self.nav_axis_combo.blockSignals(False)
 
     def get_selected_info(self):
-        index_map = {dim: int(self.index_selectors[dim].currentText().split(' ')[0]) for dim in self.dimensions}
+        self.update_nav_combo()  # apply an axis change whose rebuild is still queued
+        index_map = {}
+        for dim, selector in self.index_selectors.items():
+            if isinstance(selector, QSpinBox):
+                index_map[dim] = selector.value()
+            else:
+                index_map[dim] = max(selector.currentIndex(), 0)  # an empty dimension has no items
         x_dim = self.x_axis_combo.currentText()
         y_dim = self.y_axis_combo.currentText()
         nav_dim = self.nav_axis_combo.currentText()
@@ -119,14 +422,103 @@ class DimensionSelectorDialog(QDialog):
         
         return index_map, x_dim, y_dim, nav_dim
 
+class SlicePrefetcher(QThread):
+    """Reads navigation slices on a background thread to warm the slice cache."""
+    def __init__(self, read_slice, indices, parent=None):
+        super().__init__(parent)
+        self.read_slice = read_slice
+        self.indices = indices
+
+    def run(self):
+        for nav_idx in self.indices:
+            try:
+                self.read_slice(nav_idx)
+            except Exception:
+                # Prefetching is best-effort; real read errors surface on the GUI thread.
+                pass
+
+class PlotWorker(QThread):
+    """Reads one navigation frame off the GUI thread and hands it back through `data_ready`."""
+    data_ready = pyqtSignal(object, object)  # nav index, frame
+    failed = pyqtSignal(str)
+
+    def __init__(self, read_frame, nav_idx, prepare=None, parent=None):
+        super().__init__(parent)
+        self.read_frame = read_frame
+        self.nav_idx = nav_idx
+        self.prepare = prepare
+
+    def run(self):
+        try:
+            if self.prepare:
+                self.prepare()
+            data = self.read_frame(self.nav_idx)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.data_ready.emit(self.nav_idx, data)
+
+class NCLoader(QThread):
+    """
+    Opens a NetCDF file and collects its metadata off the GUI thread.
+
+    Everything runs under `lock`, as libnetcdf/HDF5 must never be entered from two threads
+    at once. A loader whose interruption was requested closes its dataset itself instead
+    of handing it back.
+    """
+    loaded = pyqtSignal(object, object)  # netCDF4.Dataset, metadata dict from collect_nc_metadata
+    failed = pyqtSignal(str)
+
+    def __init__(self, filepath, lock, prepare=None, parent=None):
+        super().__init__(parent)
+        self.filepath = filepath
+        self.lock = lock
+        self.prepare = prepare
+
+    def run(self):
+        with self.lock:
+            if self.isInterruptionRequested():
+                return  # superseded while waiting for the lock
+            try:
+                dataset = netCDF4.Dataset(self.filepath, 'r')
+            except Exception as e:
+                self.failed.emit(str(e))
+                return
+            try:
+                if self.prepare:
+                    self.prepare(dataset)
+                metadata = collect_nc_metadata(dataset)
+            except Exception as e:
+                dataset.close()
+                self.failed.emit(str(e))
+                return
+            if self.isInterruptionRequested():
+                dataset.close()
+                return
+        self.loaded.emit(dataset, metadata)
+
+class DatasetCloser(QThread):
+    """Closes a dataset under `lock` off the GUI thread, which may be held by a loading file."""
+    def __init__(self, dataset, lock, parent=None):
+        super().__init__(parent)
+        self.dataset = dataset
+        self.lock = lock
+
+    def run(self):
+        with self.lock:
+            try:
+                self.dataset.close()
+            except Exception as e:
+                print(f"Warning: Could not close dataset. {e}")
+
 # MODIFICATION 1: Create a new toolbar class to integrate navigation controls
 class NavigableCartopyToolbar(NavigationToolbar):
     def __init__(self, canvas, parent=None):
         super().__init__(canvas, parent)
         
         # Create navigation actions
-        self.action_prev = QAction(qta.icon('fa5s.chevron-circle-left', color='#0078d7'), "上一个", self)
-        self.action_next = QAction(qta.icon('fa5s.chevron-circle-right', color='#0078d7'), "下一个", self)
+        self.action_prev = QAction(cached_icon('fa5s.chevron-circle-left', '#0078d7'), "上一个", self)
+        self.action_next = QAction(cached_icon('fa5s.chevron-circle-right', '#0078d7'), "下一个", self)
         
         # Create a label to show navigation info and wrap it in a QWidgetAction
         self.nav_label = QLabel("N/A")
@@ -162,6 +554,18 @@ class NavigableCartopyToolbar(NavigationToolbar):
                     ax._autoscaleYon = False
             self.canvas.draw_idle()
 
+    def save_figure(self, *args):
+        # Figure.draw leaves out animated (blitted) artists, which a saved figure must include
+        animated = [artist for artist in self.canvas.figure.findobj() if artist.get_animated()]
+        for artist in animated:
+            artist.set_animated(False)
+        try:
+            return super().save_figure(*args)
+        finally:
+            for artist in animated:
+                artist.set_animated(True)
+            self.canvas.draw_idle()  # recapture the blit background at screen resolution
+
     def back(self, *args):
         try: super().back(*args)
         except AttributeError: pass
@@ -176,15 +580,29 @@ class GeospatialTool(QMainWindow):
         super().__init__()
         self.nc_dataset = None
         self.history_file = "history.txt"
+        self.settings = QSettings("GeoVisualite", "GeospatialTool")
+        self._history_file_lines = 0  # entries in the history file, including dropped and repeated ones
         self.history = self.loadHistory()
         self.current_plot_info = {}
+        self._nc_lock = threading.Lock()  # serializes reads on the shared netCDF4 handle
+        self._read_slice = None
+        self._nav_cube = None
+        self._nav_cube_axis = None  # axis of the navigation dimension in _nav_cube
+        self._frame_buf = None
+        self._prefetcher = None
+        self._plot_worker = None
+        self._nc_loader = None
+        self._var_shapes = {}  # variable name -> (dimensions, shape) from collect_nc_metadata
+        self._field = None  # full-resolution field behind the drawn, decimated artist
+        self._blit = None  # cached background and animated artists of the high-dim plot
+        self._last_error = (None, 0.0)  # (message, time.monotonic()) of the last reported error
         self.initUI()
         self.return_to_initial_state()
 
     def initUI(self):
         self.setWindowTitle('地理空间数据可视化工具 (NC/SHP) - V3.6')
         self.setGeometry(100, 100, 1400, 900)
-        self.setWindowIcon(qta.icon('fa5s.globe-asia', color="#acc3eb"))
+        self.setWindowIcon(cached_icon('fa5s.globe-asia', "#acc3eb"))
 
         main_layout = QHBoxLayout()
         splitter = QSplitter(Qt.Horizontal)
@@ -195,15 +613,15 @@ class GeospatialTool(QMainWindow):
         left_layout.setContentsMargins(0, 10, 10, 10)
         left_layout.setSpacing(10)
 
-        self.btn_open_file = QPushButton(qta.icon('fa5s.folder-open', color='white'), ' 打开文件')
+        self.btn_open_file = QPushButton(cached_icon('fa5s.folder-open', 'white'), ' 打开文件')
         self.btn_open_file.clicked.connect(self.show_file_dialog)
         self.btn_open_file.setIconSize(QSize(16, 16))
 
-        self.btn_show_history = QPushButton(qta.icon('fa5s.history', color='white'), ' 显示历史')
+        self.btn_show_history = QPushButton(cached_icon('fa5s.history', 'white'), ' 显示历史')
         self.btn_show_history.clicked.connect(self.display_history)
         self.btn_show_history.setIconSize(QSize(16, 16))
         
-        self.btn_return_home = QPushButton(qta.icon('fa5s.arrow-left', color='white'), ' 返回主界面')
+        self.btn_return_home = QPushButton(cached_icon('fa5s.arrow-left', 'white'), ' 返回主界面')
         self.btn_return_home.clicked.connect(self.return_to_initial_state)
         self.btn_return_home.setIconSize(QSize(16, 16))
 
@@ -231,12 +649,15 @@ class GeospatialTool(QMainWindow):
         info_layout = QVBoxLayout(self.info_tab)
         self.text_edit = QTextEdit(self)
         self.text_edit.setReadOnly(True)
+        self.text_edit.document().setDefaultStyleSheet(TEXT_STYLESHEET)
         info_layout.addWidget(self.text_edit)
 
         # Plot Tab
         plot_layout = QVBoxLayout(self.plot_tab)
         self.figure = plt.figure()
         self.canvas = FigureCanvas(self.figure)
+        # paintEvent erases and repaints every exposed rect itself, so Qt's background fill is wasted
+        self.canvas.setAttribute(Qt.WA_OpaquePaintEvent, True)
         
         # MODIFICATION 1: Use the new NavigableCartopyToolbar
         self.toolbar = NavigableCartopyToolbar(self.canvas, self)
@@ -244,6 +665,19 @@ class GeospatialTool(QMainWindow):
         # Connect the toolbar's navigation actions to the main window's methods
         self.toolbar.action_prev.triggered.connect(self.navigate_dim_prev)
         self.toolbar.action_next.triggered.connect(self.navigate_dim_next)
+        # Coalesces rapid Prev/Next clicks into at most one frame request per 50 ms (~20 Hz)
+        self._nav_timer = QTimer(self)
+        self._nav_timer.setSingleShot(True)
+        self._nav_timer.setInterval(50)
+        self._nav_timer.timeout.connect(self.request_frame)
+        # Re-renders the field for the new view once zooming, panning or resizing settles
+        self._view_timer = QTimer(self)
+        self._view_timer.setSingleShot(True)
+        self._view_timer.setInterval(150)
+        self._view_timer.timeout.connect(self.refresh_field_view)
+        
+        self.canvas.mpl_connect('resize_event', self.on_canvas_resize)
+        self.canvas.mpl_connect('draw_event', self.on_canvas_draw)
         
         plot_layout.addWidget(self.toolbar)
         plot_layout.addWidget(self.canvas)
@@ -287,17 +721,24 @@ class GeospatialTool(QMainWindow):
             ax.format_coord = fallback_formatter
             return
 
+        # sort the coordinates once so every mouse move is a binary search instead of a full scan
+        x_order = np.argsort(np.ma.getdata(x_coords_1d), kind='stable')
+        y_order = np.argsort(np.ma.getdata(y_coords_1d), kind='stable')
+        x_sorted = np.ascontiguousarray(np.ma.getdata(x_coords_1d)[x_order])
+        y_sorted = np.ascontiguousarray(np.ma.getdata(y_coords_1d)[y_order])
+        # split the masked array into plain arrays so the per-event lookup never touches np.ma
+        values = np.ma.getdata(data_array)
+        mask = np.ma.getmaskarray(data_array)
+
         def formatter(x, y):
-            # find the closest indices in the 1D coordinate arrays
-            col_idx = np.abs(x_coords_1d - x).argmin()
-            row_idx = np.abs(y_coords_1d - y).argmin()
+            # find the closest cell and its value
+            row_idx, col_idx, value, is_masked = lookup_value(
+                x_sorted, x_order, y_sorted, y_order, values, mask, float(x), float(y))
 
             # check if the indices are within bounds of the data array
-            if 0 <= row_idx < data_array.shape[0] and 0 <= col_idx < data_array.shape[1]:
-                value = data_array[row_idx, col_idx]
-                
+            if row_idx >= 0:
                 # process the value to handle masked arrays
-                if np.ma.is_masked(value):
+                if is_masked:
                     value_str = "N/A (masked)"
                 else:
                     value_str = f"{value:.4f}" 
@@ -367,25 +808,55 @@ class GeospatialTool(QMainWindow):
         elif ext.lower() == '.shp':
             self.load_shp_file(filepath)
         else:
-            self.show_error_message(f"不支持的文件类型: {ext}")
+            self.show_error_message(f"不支持的文件类型: {ext}", fatal=True)
             return
 
         if filepath not in self.history:
             self.history.append(filepath)
-            self.saveHistory()
+            self.saveHistory(filepath)
 
     def load_nc_file(self, filepath):
-        try:
-            if self.nc_dataset:
-                self.nc_dataset.close()
-            self.nc_dataset = netCDF4.Dataset(filepath, 'r')
-            self.append_formatted_text(f"文件: {filepath}\n", title=True)
-            self.display_nc_metadata()
-            self.populate_variable_list()
-            self.tabs.setCurrentWidget(self.info_tab)
-        except Exception as e:
-            self.show_error_message(f"读取NC文件失败 {filepath}: {e}")
+        """Opens the file on an NCLoader thread; on_nc_loaded then shows its metadata."""
+        if self.nc_dataset:
+            self.close_dataset(self.nc_dataset)
             self.nc_dataset = None
+        self.append_formatted_text(f"文件: {filepath}\n", title=True)
+        self.statusBar().showMessage(f"正在读取 {filepath} ...")
+        prepare = functools.partial(tune_chunk_cache, cache_mb=self.chunk_cache_mb())
+        self._nc_loader = NCLoader(filepath, self._nc_lock, prepare, self)
+        self._nc_loader.loaded.connect(self.on_nc_loaded)
+        self._nc_loader.failed.connect(self.on_nc_failed)
+        self._start_worker(self._nc_loader)
+
+    def on_nc_loaded(self, dataset, metadata):
+        if self.sender() is not self._nc_loader:
+            self.close_dataset(dataset)  # superseded by another file or by returning to the start page
+            return
+        self._nc_loader = None
+        self.statusBar().clearMessage()
+        self.nc_dataset = dataset
+        self._var_shapes = {name: (dims, shape) for name, dims, shape, _, _, _ in metadata['variables']}
+        self.display_nc_metadata(metadata)
+        self.populate_variable_list(metadata)
+        self.tabs.setCurrentWidget(self.info_tab)
+
+    def on_nc_failed(self, message):
+        loader = self.sender()
+        if loader is not self._nc_loader:
+            return
+        self._nc_loader = None
+        self.statusBar().clearMessage()
+        self.show_error_message(f"读取NC文件失败 {loader.filepath}: {message}", fatal=True)
+
+    def close_dataset(self, dataset):
+        """Closes `dataset` on a DatasetCloser thread, so the GUI never waits for the netCDF lock."""
+        self._start_worker(DatasetCloser(dataset, self._nc_lock, self))
+
+    def chunk_cache_mb(self):
+        """Per-variable chunk cache size in MB, kept in the settings so it can be tuned per machine."""
+        if not self.settings.contains("netcdf/chunk_cache_mb"):
+            self.settings.setValue("netcdf/chunk_cache_mb", NC_CHUNK_CACHE_MB)
+        return self.settings.value("netcdf/chunk_cache_mb", NC_CHUNK_CACHE_MB, type=int)
 
     def load_shp_file(self, filepath):
         try:
@@ -398,48 +869,55 @@ class GeospatialTool(QMainWindow):
             self.plot_shp_data(gdf)
             self.tabs.setCurrentWidget(self.plot_tab)
         except Exception as e:
-            self.show_error_message(f"读取SHP文件失败 {filepath}: {e}")
+            self.show_error_message(f"读取SHP文件失败 {filepath}: {e}", fatal=True)
             
-    # ... (display_nc_metadata, populate_variable_list methods are unchanged)
-    def display_nc_metadata(self):
-        if not self.nc_dataset: return
-        self.append_formatted_text("全局属性:", header=True)
-        if not self.nc_dataset.ncattrs():
-             self.append_formatted_text("  (无)", italic=True)
-        for attr_name in self.nc_dataset.ncattrs():
-            self.append_formatted_text(f"  {attr_name}: {getattr(self.nc_dataset, attr_name)}")
-        self.append_formatted_text("\n维度信息:", header=True)
-        for dim_name, dim in self.nc_dataset.dimensions.items():
-            self.append_formatted_text(f"  {dim_name}: size = {len(dim)}")
-        self.append_formatted_text("\n变量信息:", header=True)
-        for var_name, var in self.nc_dataset.variables.items():
-            self.append_formatted_text(f"  {var_name}: dims={var.dimensions}, shape={var.shape}, type={var.dtype}", bold=True)
-            for attr_name in var.ncattrs():
-                self.append_formatted_text(f"    {attr_name}: {getattr(var, attr_name)}")
-
-    def populate_variable_list(self):
+    def display_nc_metadata(self, metadata):
+        # Build the whole dump first and insert it once instead of one layout pass per line
+        lines = [html_line("全局属性:", 'header')]
+        if not metadata['attrs']:
+             lines.append(html_line("  (无)", 'italic'))
+        for attr_name, value in metadata['attrs']:
+            lines.append(html_line(f"  {attr_name}: {value}"))
+        lines.append(html_line("\n维度信息:", 'header'))
+        for dim_name, size in metadata['dimensions']:
+            lines.append(html_line(f"  {dim_name}: size = {size}"))
+        lines.append(html_line("\n变量信息:", 'header'))
+        for var_name, dims, shape, dtype, chunks, attrs in metadata['variables']:
+            lines.append(html_line(f"  {var_name}: dims={dims}, shape={shape}, type={dtype}, chunks={chunks}", 'bold'))
+            for attr_name, value in attrs:
+                lines.append(html_line(f"    {attr_name}: {value}"))
+        self.append_html_lines(lines)
+
+    def populate_variable_list(self, metadata):
         self.variable_list.clear()
-        if not self.nc_dataset: return
-        for var_name, var in self.nc_dataset.variables.items():
-            if len(var.shape) >= 2:
-                item_text = f"{var_name} {var.shape}"
-                list_item = QListWidgetItem(qta.icon('fa5s.ruler-combined', color='#0078d7'), item_text)
-                self.variable_list.addItem(list_item)
-                
+        icon = cached_icon('fa5s.ruler-combined', '#0078d7')  # shared by every list item
+        self.variable_list.setUpdatesEnabled(False)
+        try:
+            for var_name, _, shape, _, _, _ in metadata['variables']:
+                if len(shape) >= 2:
+                    item_text = f"{var_name} {shape}"
+                    list_item = QListWidgetItem(icon, item_text)
+                    self.variable_list.addItem(list_item)
+        finally:
+            self.variable_list.setUpdatesEnabled(True)
+
     def on_variable_selected(self, item):
         if not self.nc_dataset: return
         
         variable_name = item.text().split(' ')[0]
-        var = self.nc_dataset.variables[variable_name]
+        # Shapes come from the metadata collected at load time: querying the variable here
+        # would enter libnetcdf while a SlicePrefetcher of the current plot may be reading
+        dimensions, shape = self._var_shapes[variable_name]
         
-        if var.ndim > 2:
-            dialog = DimensionSelectorDialog(var, self)
+        if sum(size > 1 for size in shape) > 2:
+            dialog = DimensionSelectorDialog(dimensions, shape, self)
             if dialog.exec_() == QDialog.Accepted:
                 selected_info = dialog.get_selected_info()
                 if selected_info is None:
                     self.show_error_message("X 和 Y 轴不能选择相同的维度。")
                     return
                 index_map, x_dim, y_dim, nav_dim = selected_info
+                var = self.nc_dataset.variables[variable_name]
                 self.setup_high_dim_plot(var, index_map, x_dim, y_dim, nav_dim)
         else:
             self.plot_nc_variable(variable_name)
@@ -449,134 +927,474 @@ class GeospatialTool(QMainWindow):
     def clear_plot(self):
         """Clears the figure and hides any plot-specific controls."""
         self.current_plot_info = {}
+        self._nav_timer.stop()
+        self._view_timer.stop()
+        self._stop_workers()
+        self._read_slice = None
+        self._nav_cube = None
+        self._frame_buf = None
+        self._field = None
+        self._blit = None
         self.toolbar.show_nav_controls(False) # MODIFICATION 1: Hide controls in toolbar
-        self.figure.clear()
-        self.canvas.draw()
+        if self.figure.axes:  # an empty figure (e.g. on startup) needs no clear or redraw
+            self.figure.clear()
+            self.canvas.draw_idle()
         
     def setup_high_dim_plot(self, var, index_map, x_dim, y_dim, nav_dim):
         """Stores plotting info and triggers the first plot."""
         self.clear_plot()
-        self.current_plot_info = {
-            'var': var, 'index_map': index_map, 'x_dim': x_dim,
-            'y_dim': y_dim, 'nav_dim': nav_dim
-        }
+        x_vals = self.nc_dataset.variables.get(x_dim)
+        y_vals = self.nc_dataset.variables.get(y_dim)
+        if x_vals is None or y_vals is None:
+            self.show_error_message("无法获取指定的经纬度坐标变量。")
+            return
+        with self._nc_lock:  # a DatasetCloser may still be closing the previous file
+            # The coordinates don't change while navigating, so they are read once per plot
+            x, y = x_vals[:], y_vals[:]
+            # only longitudes wrap; any other X axis (level, time, projected x) is left alone
+            x, x_roll = wrap_longitudes(x) if is_longitude(x_vals) else (x, 0)
+            dimensions, shape = var.dimensions, var.shape
+            self.current_plot_info = {
+                'var': var, 'index_map': index_map, 'x_dim': x_dim,
+                'y_dim': y_dim, 'nav_dim': nav_dim,
+                # read once here so the GUI thread doesn't query the file while workers read it
+                'var_name': var.name, 'units': getattr(var, 'units', ''),
+                'nav_size': shape[dimensions.index(nav_dim)] if nav_dim else 0,
+                'x': x, 'y': y, 'x_len': len(x), 'y_len': len(y), 'x_roll': x_roll,
+                # frames keep the variable's dimension order, so (x, y) slabs need a transpose
+                'transpose': dimensions.index(x_dim) < dimensions.index(y_dim),
+            }
+        self._read_slice = self._make_slice_reader(var, dimensions, index_map, x_dim, y_dim, nav_dim)
+        load_cube = None
         if nav_dim:
+            load_cube = functools.partial(self._load_nav_cube, var, dimensions, shape,
+                                          index_map, x_dim, y_dim, nav_dim)
             self.toolbar.show_nav_controls(True) # MODIFICATION 1: Show controls in toolbar
-        self.update_high_dim_plot()
+        self.request_frame(prepare=load_cube)
+
+    def request_frame(self, prepare=None):
+        """Reads the current frame on a PlotWorker thread; on_frame_ready then draws it."""
+        info = self.current_plot_info
+        nav_dim = info['nav_dim']
+        # Block further navigation until this frame is drawn so clicks can't pile up
+        self.toolbar.action_prev.setEnabled(False)
+        self.toolbar.action_next.setEnabled(False)
+        nav_idx = info['index_map'][nav_dim] if nav_dim else None
+        self._plot_worker = PlotWorker(self._read_frame, nav_idx, prepare, self)
+        self._plot_worker.data_ready.connect(self.on_frame_ready)
+        self._plot_worker.failed.connect(self.on_frame_failed)
+        self._start_worker(self._plot_worker)
+
+    def on_frame_ready(self, nav_idx, data):
+        if self.sender() is not self._plot_worker:
+            return  # result of a plot that has since been cleared
+        self.update_high_dim_plot(data)
+
+    def on_frame_failed(self, message):
+        if self.sender() is not self._plot_worker:
+            return
+        self.show_error_message(f"高维数据绘图失败: {message}")
+        self.clear_plot()
+
+    def _make_slice_reader(self, var, dimensions, index_map, x_dim, y_dim, nav_dim):
+        """
+        Returns an LRU-cached reader for the 2D slab of `var` at a given navigation index.
+
+        The fixed indices are resolved once here, so a read only splices `nav_idx` into
+        prebuilt index tuples instead of walking the dimensions and the index map.
+        `dimensions` is var.dimensions, read under the netCDF lock by the caller.
+        """
+        slice_obj = tuple(slice(None) if d in (x_dim, y_dim) or d == nav_dim else index_map[d]
+                          for d in dimensions)
+        if nav_dim:
+            nav_pos = dimensions.index(nav_dim)
+            head, tail = slice_obj[:nav_pos], slice_obj[nav_pos + 1:]
+            make_key = lambda nav_idx: head + (nav_idx,) + tail
+        else:
+            make_key = lambda nav_idx: slice_obj
+        lock = self._nc_lock
+
+        @functools.lru_cache(maxsize=16)
+        def read_slice(nav_idx):
+            with lock:
+                data = var[make_key(nav_idx)]
+            return as_display_array(data)
+
+        return read_slice
+
+    def _load_nav_cube(self, var, dimensions, shape, index_map, x_dim, y_dim, nav_dim):
+        """
+        Reads the whole (nav, y, x) sub-cube in one contiguous read if it is small enough.
 
-    def update_high_dim_plot(self):
-        """Plots the data based on current_plot_info. This is the core refresh function."""
+        `dimensions` and `shape` are those of `var`, read under the netCDF lock by the caller.
+        """
+        cube_dims = [d for d in dimensions if d in [x_dim, y_dim, nav_dim]]
+        slice_obj = [slice(None) if d in cube_dims else index_map[d] for d in dimensions]
+        cube_size = np.prod([shape[dimensions.index(d)] for d in cube_dims])
+        with self._nc_lock:
+            # packed integers are unpacked to float64 on read; the read, its mask and the
+            # float32 copy made by as_display_array are all alive at the peak
+            packed = any(attr in var.ncattrs() for attr in ('scale_factor', 'add_offset'))
+            read_itemsize = 8 if packed else np.dtype(var.dtype).itemsize
+            if cube_size * (read_itemsize + 1 + 4) >= NAV_CUBE_MAX_BYTES:
+                return  # too large, fall back to per-frame reads
+            try:
+                cube = var[tuple(slice_obj)]
+            except MemoryError:
+                return
+        self._nav_cube_axis = cube_dims.index(nav_dim)
+        self._nav_cube = as_display_array(cube)
+
+    def _read_frame(self, nav_idx):
+        """Returns the 2D frame at `nav_idx`, from the in-memory sub-cube when available."""
+        if self._nav_cube is None:
+            return self._read_slice(nav_idx)
+        cube_idx = [slice(None)] * self._nav_cube.ndim
+        cube_idx[self._nav_cube_axis] = nav_idx
+        return self._nav_cube[tuple(cube_idx)]
+
+    def _prefetch_neighbours(self, nav_idx, nav_size):
+        """Reads the frames adjacent to `nav_idx` into the slice cache on a background thread."""
+        if self._nav_cube is not None:
+            return  # every frame is already in memory
+        if self._prefetcher is not None and self._prefetcher.isRunning():
+            return
+        indices = [i for i in (nav_idx + 1, nav_idx - 1) if 0 <= i < nav_size]
+        if not indices: return
+        self._prefetcher = SlicePrefetcher(self._read_slice, indices, self)
+        self._start_worker(self._prefetcher)
+
+    def _start_worker(self, worker):
+        """Starts a worker thread that is forgotten and deleted once it has finished."""
+        # connected before deleteLater, so references are dropped before the object goes away
+        worker.finished.connect(functools.partial(self._forget_worker, worker))
+        worker.finished.connect(worker.deleteLater)
+        worker.start()
+
+    def _forget_worker(self, worker):
+        for attr in ('_plot_worker', '_prefetcher', '_nc_loader'):
+            if getattr(self, attr) is worker:
+                setattr(self, attr, None)
+
+    def _stop_workers(self):
+        """
+        Waits for in-flight frame reads so the dataset can be safely cleared or closed.
+
+        A file still loading is not waited for, as opening a large file can take long; it
+        is interrupted and closes its dataset itself, or on_nc_loaded drops the result.
+        """
+        for worker in (self._plot_worker, self._prefetcher):
+            if worker is not None:
+                worker.wait()
+        if self._nc_loader is not None:
+            self._nc_loader.requestInterruption()
+        self._plot_worker = None
+        self._prefetcher = None
+        self._nc_loader = None
+
+    def update_high_dim_plot(self, data):
+        """
+        Plots the data based on current_plot_info. This is the core refresh function.
+
+        Args:
+            data: The current frame as read by a PlotWorker.
+        """
         if not self.current_plot_info: return
 
         info = self.current_plot_info
-        var, index_map, x_dim, y_dim, nav_dim = info.values()
+        index_map = info['index_map']
+        nav_dim = info['nav_dim']
         
         try:
-            slice_obj = []
-            for dim_name in var.dimensions:
-                if dim_name in [x_dim, y_dim]:
-                    slice_obj.append(slice(None))
-                else:
-                    slice_obj.append(index_map[dim_name])
-            
-            data = var[tuple(slice_obj)]
-            x_vals = self.nc_dataset.variables.get(x_dim)
-            y_vals = self.nc_dataset.variables.get(y_dim)
+            x, y, x_len, y_len = info['x'], info['y'], info['x_len'], info['y_len']
 
-            if x_vals is None or y_vals is None:
-                self.show_error_message("无法获取指定的经纬度坐标变量。")
-                return
-            
-            x, y = x_vals[:], y_vals[:]
-            
             # ANALYSIS 2 FIX: Robustly handle data/coordinate alignment
-            if data.shape == (len(y), len(x)):
-                # Data shape is (lat, lon), which is standard
-                lon, lat = np.meshgrid(x, y)
-            elif data.shape == (len(x), len(y)):
+            if info['transpose']:
                 # Data shape is (lon, lat), requires transpose for plotting
-                lon, lat = np.meshgrid(x, y)
                 data = data.T
-            else:
-                self.show_error_message(f"数据形状 {data.shape} 与坐标轴长度 (Y={len(y)}, X={len(x)}) 不匹配。")
+            if data.shape != (y_len, x_len):
+                self.show_error_message(f"数据形状 {data.shape} 与坐标轴长度 (Y={y_len}, X={x_len}) 不匹配。")
+                self.clear_plot()  # request_frame disabled Prev/Next; nothing can be navigated
                 return
+            data = self.copy_to_frame_buffer(data, info['x_roll'])
 
-            self.figure.clear()
-            ax = self.figure.add_subplot(1, 1, 1, projection=ccrs.PlateCarree())
-            self.set_custom_coord_format(ax, data, x, y)  # Set custom coordinate format
-            ax._autoscaleXon = False
-            ax._autoscaleYon = False
-            
-            # The set_extent call should now be safe
-            ax.set_extent([np.min(lon), np.max(lon), np.min(lat), np.max(lat)], crs=ccrs.PlateCarree())
-            
-            im = ax.pcolormesh(lon, lat, data, transform=ccrs.PlateCarree(), cmap='viridis', shading='auto')
-            ax.coastlines()
-            ax.gridlines(draw_labels=True, linestyle='--', color='gray', alpha=0.5)
-            cbar = plt.colorbar(im, ax=ax, orientation='vertical', pad=0.08, shrink=0.8)
-            cbar.set_label(f"{var.name} ({getattr(var, 'units', '')})")
-            
-            # Update title and navigation label in the toolbar
-            slice_info = ", ".join([f"{k}={v}" for k, v in index_map.items() if k not in [x_dim, y_dim, nav_dim]])
-            ax.set_title(f"{var.name} ({slice_info})", pad=20)
+            # Keep the full-resolution frame for the coordinate formatter, draw a decimated one
+            if self._blit is not None:
+                # Only the navigation index changed: swap the frame into the cached artists
+                self._field['data'] = data
+                self._blit_update(data, x, y)
+            else:
+                self._build_plot(data, x, y)
 
+            # Update navigation label in the toolbar
             if nav_dim:
                 current_idx = index_map[nav_dim]
-                max_idx = var.shape[var.dimensions.index(nav_dim)]
+                max_idx = info['nav_size']
                 self.toolbar.update_nav_label(f"{nav_dim}: {current_idx + 1} / {max_idx}")
                 self.toolbar.action_prev.setEnabled(current_idx > 0)
                 self.toolbar.action_next.setEnabled(current_idx < max_idx - 1)
+                self._prefetch_neighbours(current_idx, max_idx)
 
-            self.canvas.draw()
             self.tabs.setCurrentWidget(self.plot_tab)
             
         except Exception as e:
             self.show_error_message(f"高维数据绘图失败: {e}")
             self.clear_plot()
 
-    # ... (Other methods like plot_nc_variable, plot_shp_data, navigate_dim, etc., remain largely the same)
+    def _build_plot(self, data, x, y):
+        """Builds the axes, overlays and colorbar of the high-dim plot around its first frame."""
+        info = self.current_plot_info
+        self.figure.clear()
+        ax = self.figure.add_subplot(1, 1, 1, projection=_PLATE_CARREE)
+        self.set_custom_coord_format(ax, data, x, y)  # Set custom coordinate format
+        ax._autoscaleXon = False
+        ax._autoscaleYon = False
+
+        # The set_extent call should now be safe
+        ax.set_extent([float(x.min()), float(x.max()), float(y.min()), float(y.max())], crs=_PLATE_CARREE)
+
+        self._field = {'ax': ax, 'data': data, 'x': x, 'y': y}
+        self._set_field_window(*self.field_view(ax, x, y, data.shape))
+        im = self.draw_field(ax, *self.field_sample())
+        coast = ax.add_feature(_COASTLINES)
+        gl = ax.gridlines(draw_labels=True, linestyle='--', color='gray', alpha=0.5)
+        cbar = plt.colorbar(im, ax=ax, orientation='vertical', pad=0.08, shrink=0.8)
+        cbar.set_label(f"{info['var_name']} ({info['units']})")
+        self._field.update(artist=im, cbar=cbar)
+        ax.callbacks.connect('xlim_changed', self.on_view_changed)
+        ax.callbacks.connect('ylim_changed', self.on_view_changed)
+
+        # Update title
+        plot_dims = [info['x_dim'], info['y_dim'], info['nav_dim']]
+        slice_info = ", ".join([f"{k}={v}" for k, v in info['index_map'].items() if k not in plot_dims])
+        ax.set_title(f"{info['var_name']} ({slice_info})", pad=20)
+
+        # The frame, the overlays drawn above it and the colorbar (whose range follows the
+        # frame) are animated: full draws leave them out of the cached background and
+        # on_canvas_draw paints them back on top.
+        animated = [im, coast] + ([gl] if isinstance(gl, Artist) else []) + [cbar.ax]
+        for artist in animated:
+            artist.set_animated(True)
+        self._blit = {'ax': ax, 'artists': animated, 'background': None}
+        self.canvas.draw_idle()
+
+    def copy_to_frame_buffer(self, data, roll=0):
+        """
+        Copies a frame into the reusable float32 buffer of the current plot.
+
+        The same (ny, nx) buffer is filled on every navigation step, so frames taken from
+        the sub-cube or the slice cache are never modified and no per-frame array is made.
+        A non-zero `roll` shifts the columns like np.roll, to match wrap_longitudes.
+        """
+        if self._frame_buf is None or self._frame_buf.shape != data.shape:
+            self._frame_buf = np.empty(data.shape, dtype=np.float32)
+        if roll:
+            np.copyto(self._frame_buf[:, roll:], data[:, :-roll])
+            np.copyto(self._frame_buf[:, :roll], data[:, -roll:])
+        else:
+            np.copyto(self._frame_buf, data)
+        return self._frame_buf
+
+    def field_view(self, ax, x, y, shape):
+        """
+        Returns (window, strides) for drawing a field of `shape` at the current view of `ax`.
+
+        `window` (row0, row1, col0, col1) is the part of the field in view, and the strides
+        put at most ~2 of its cells on each pixel of `ax`.
+        """
+        window = (0, shape[0], 0, shape[1])
+        if ax.projection == _PLATE_CARREE:  # view limits are in degrees, like the coordinates
+            window = visible_window(x, y, ax.get_xlim(), ax.get_ylim()) or window
+        row0, row1, col0, col1 = window
+        stride_y = max(1, (row1 - row0) // max(1, int(ax.bbox.height * 2)))
+        stride_x = max(1, (col1 - col0) // max(1, int(ax.bbox.width * 2)))
+        return window, (stride_y, stride_x)
+
+    def _set_field_window(self, window, strides):
+        """Sets the part of the field to draw: `window` padded by half its size, so small pans fit."""
+        row0, row1, col0, col1 = window
+        pad_y, pad_x = (row1 - row0) // 2, (col1 - col0) // 2
+        ny, nx = self._field['data'].shape
+        self._field['window'] = (max(row0 - pad_y, 0), min(row1 + pad_y, ny),
+                                 max(col0 - pad_x, 0), min(col1 + pad_x, nx))
+        self._field['strides'] = strides
+
+    def field_sample(self):
+        """Returns the drawn part of the current field and its coordinates, decimated by the strides."""
+        field = self._field
+        row0, row1, col0, col1 = field['window']
+        x, y = field['x'], field['y']
+        if np.ndim(x) == 1:
+            x, y = x[col0:col1], y[row0:row1]
+        else:
+            x, y = x[row0:row1, col0:col1], y[row0:row1, col0:col1]
+        return decimate(field['data'][row0:row1, col0:col1], x, y, *field['strides'])
+
+    def on_view_changed(self, ax):
+        """Schedules a re-render of the field once zooming or panning `ax` settles."""
+        if self._field is not None and ax is self._field['ax']:
+            self._view_timer.start()
+
+    def refresh_field_view(self):
+        """Redraws the field for the current view if the drawn window or resolution no longer fits it."""
+        field = self._field
+        if field is None or 'artist' not in field:
+            return
+        ax = field['ax']
+        visible, strides = self.field_view(ax, field['x'], field['y'], field['data'].shape)
+        row0, row1, col0, col1 = field['window']
+        if (strides == field['strides'] and row0 <= visible[0] and visible[1] <= row1
+                and col0 <= visible[2] and visible[3] <= col1):
+            return
+        self._set_field_window(visible, strides)
+        old = field['artist']
+        ax.set_autoscale_on(False)  # adding the new artist must not move the user's view
+        new = self.draw_field(ax, *self.field_sample())
+        new.set_clim(*old.get_clim())
+        new.set_zorder(old.get_zorder())
+        new.set_animated(old.get_animated())
+        old.remove()
+        # Hand the colorbar over to the new artist, which later frames rescale
+        cbar = field['cbar']
+        new.colorbar = cbar
+        new.callbacks.connect('changed', cbar.update_normal)
+        cbar.update_normal(new)
+        field['artist'] = new
+        if self._blit is not None:
+            self._blit['artists'][0] = new
+        self.canvas.draw_idle()
+
+    def on_canvas_resize(self, event):
+        """Re-renders the field if the new canvas size calls for a different decimation."""
+        if self._blit is not None:
+            self._blit['background'] = None  # stale until the next full draw recaptures it
+        if self._field is not None:
+            self._view_timer.start()
+
+    def on_canvas_draw(self, event):
+        """Captures the static background after a full draw and paints the animated artists on top."""
+        if self._blit is None or event.canvas is not self.canvas:
+            return  # e.g. the PDF/SVG canvas savefig switches to
+        if not self._blit['artists'][0].get_animated():
+            return  # a PNG save of the toolbar, which draws every artist itself at the save DPI
+        self._blit['background'] = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.draw_animated_artists()
+
+    def draw_animated_artists(self):
+        """Draws the animated artists of the high-dim plot into the canvas buffer."""
+        for artist in self._blit['artists']:
+            self.figure.draw_artist(artist)
+
+    def _blit_update(self, data, x, y):
+        """Redraws only the frame and its colorbar on top of the cached background."""
+        self.set_custom_coord_format(self._blit['ax'], data, x, y)
+        shown, shown_x, shown_y = self.field_sample()
+        artist = self._blit['artists'][0]
+        self.set_field_data(artist, shown, shown_x, shown_y)
+        # Rescale to this frame, as a freshly built plot would
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN frame
+            vmin, vmax = np.nanmin(shown), np.nanmax(shown)
+        if np.isfinite(vmin) and np.isfinite(vmax):
+            artist.set_clim(vmin, vmax)
+        if self._blit['background'] is None:
+            # No clean background yet (e.g. right after a resize); a full draw recaptures it
+            self.canvas.draw_idle()
+            return
+        # The whole figure is restored and blitted: gridline and colorbar labels are drawn
+        # outside the axes and must not be painted over themselves
+        self.canvas.restore_region(self._blit['background'])
+        self.draw_animated_artists()
+        self.canvas.blit(self.figure.bbox)
+
+    def draw_field(self, ax, data, x, y):
+        """
+        Draws a 2D field on the GeoAxes and returns the artist.
+
+        Regular 1D grids are drawn as a single image, which skips Cartopy's per-cell
+        transform; curvilinear or irregular grids fall back to pcolormesh.
+        """
+        if is_regular_grid(x, y):
+            image_data, image_x, image_y = ascending_view(data, x, y)
+            # pad by half a cell so pixels are centred on the coordinates, like shading='auto'
+            half_dx = (float(image_x[-1]) - float(image_x[0])) / (len(image_x) - 1) / 2
+            half_dy = (float(image_y[-1]) - float(image_y[0])) / (len(image_y) - 1) / 2
+            extent = [float(image_x[0]) - half_dx, float(image_x[-1]) + half_dx,
+                      float(image_y[0]) - half_dy, float(image_y[-1]) + half_dy]
+            # Cartopy only draws the image directly when it lies within the projection bounds
+            # (full 0-360 grids are wrapped beforehand); anything else would be regridded
+            (x0, x1), (y0, y1) = ax.projection.x_limits, ax.projection.y_limits
+            eps = ax.projection.threshold
+            if (x0 - eps <= extent[0] and extent[1] <= x1 + eps and
+                    y0 - eps <= extent[2] and extent[3] <= y1 + eps):
+                return ax.imshow(image_data, extent=extent, origin='lower', transform=_PLATE_CARREE,
+                                 interpolation='nearest', cmap='viridis')
+
+        # The NC axes are PlateCarree, so there is nothing to pre-project; Cartopy's own
+        # pcolormesh handles cells across the dateline
+        return ax.pcolormesh(x, y, data, transform=_PLATE_CARREE, cmap='viridis', shading='auto')
+
+    def set_field_data(self, artist, data, x, y):
+        """Replaces the values of an artist made by draw_field with a frame of the same shape."""
+        if isinstance(artist, AxesImage):
+            artist.set_data(ascending_view(data, x, y)[0])
+        else:
+            artist.set_array(data)
+
     def plot_nc_variable(self, var_name):
         self.clear_plot()
         try:
             var = self.nc_dataset.variables[var_name]
-            data = np.squeeze(var[:])
-            if data.ndim != 2:
-                self.show_error_message(f"变量 '{var_name}' 无法简化为二维数组 (shape: {data.shape}).")
-                return
-            lon_1d, lat_1d = None, None
-            possible_lon_names = ['lon', 'longitude', 'x']
-            possible_lat_names = ['lat', 'latitude', 'y']
-            var_dims = var.dimensions
-            
-            # 尝试从变量的维度中寻找坐标轴名称
-            lon_dim_name = next((d for d in var_dims for n in possible_lon_names if n in d.lower()), None)
-            lat_dim_name = next((d for d in var_dims for n in possible_lat_names if n in d.lower()), None)
-
-            if lon_dim_name and lat_dim_name:
-                # 确保维度存在于文件中
-                if lon_dim_name in self.nc_dataset.variables and lat_dim_name in self.nc_dataset.variables:
-                    lon_1d = self.nc_dataset.variables[lon_dim_name][:]
-                    lat_1d = self.nc_dataset.variables[lat_dim_name][:]
-            
-            lon, lat = self.find_nc_coords(var)
-            if lon is None or lat is None:
-                self.show_error_message(f"无法自动找到 '{var_name}' 的经纬度坐标。")
+            with self._nc_lock:  # a DatasetCloser may still be closing the previous file
+                data = as_display_array(var[squeeze_index(var.shape)])
+                if data.ndim != 2:
+                    self.show_error_message(f"变量 '{var_name}' 无法简化为二维数组 (shape: {data.shape}).")
+                    return
+                lon_var, lat_var = self.find_nc_coords(var)
+                if lon_var is None or lat_var is None:
+                    self.show_error_message(f"无法自动找到 '{var_name}' 的经纬度坐标。")
+                    return
+                lon, lat = separable_axes(read_coordinate(lon_var), read_coordinate(lat_var))
+                units = getattr(var, 'units', '')
+                long_name = getattr(var, 'long_name', var_name)
+                wrap_lon = is_longitude(lon_var)
+            # The field must match the coordinates: (lat, lon), or transposed like the
+            # high-dim plot's (lon, lat) slabs
+            if np.ndim(lon) == 1 and np.ndim(lat) == 1:
+                expected = (len(lat), len(lon))
+            else:
+                expected = np.shape(lon)
+            if data.shape != expected and data.shape[::-1] == expected:
+                data = data.T
+            elif data.shape != expected:
+                self.show_error_message(f"数据形状 {data.shape} 与坐标轴形状 {expected} 不匹配。")
                 return
+            if wrap_lon and np.ndim(lat) == 1:
+                lon, lon_roll = wrap_longitudes(lon)
+                if lon_roll:
+                    data = np.roll(data, lon_roll, axis=1)
 
-            ax: GeoAxes = self.figure.add_subplot(1, 1, 1, projection=ccrs.PlateCarree())
-            self.set_custom_coord_format(ax, data, lon_1d, lat_1d)  # Set custom coordinate format
+            ax: GeoAxes = self.figure.add_subplot(1, 1, 1, projection=_PLATE_CARREE)
+            self.set_custom_coord_format(ax, data, lon, lat)  # Set custom coordinate format
             ax._autoscaleXon = False
             ax._autoscaleYon = False
             ax.set_global()
             
-            im = ax.pcolormesh(lon, lat, data, transform=ccrs.PlateCarree(), cmap='viridis', shading='auto')
-            ax.coastlines()
+            # Draw at most ~2 cells per pixel; the formatter above still reads the full field,
+            # and resizes and zooms re-render it through refresh_field_view
+            self._field = {'ax': ax, 'data': data, 'x': lon, 'y': lat}
+            self._set_field_window(*self.field_view(ax, lon, lat, data.shape))
+            im = self.draw_field(ax, *self.field_sample())
+            ax.add_feature(_COASTLINES)
             ax.gridlines(draw_labels=True, linestyle='--', color='gray', alpha=0.5)
             cbar = plt.colorbar(im, ax=ax, orientation='vertical', pad=0.08, shrink=0.8)
-            cbar.set_label(f"{var_name} ({getattr(var, 'units', '')})")
-            ax.set_title(f"变量: {getattr(var, 'long_name', var_name)}", pad=20)
+            cbar.set_label(f"{var_name} ({units})")
+            ax.set_title(f"变量: {long_name}", pad=20)
+            self._field.update(artist=im, cbar=cbar)
+            ax.callbacks.connect('xlim_changed', self.on_view_changed)
+            ax.callbacks.connect('ylim_changed', self.on_view_changed)
             
-            self.canvas.draw()
+            self.canvas.draw_idle()
             self.tabs.setCurrentWidget(self.plot_tab)
         except Exception as e:
             self.show_error_message(f"绘制变量 '{var_name}' 出错: {e}")
@@ -590,10 +1408,10 @@ class GeospatialTool(QMainWindow):
             if source_crs:
                 try:
                     epsg = source_crs.to_epsg()
-                    if epsg: cartopy_crs = ccrs.epsg(epsg)
+                    if epsg: cartopy_crs = epsg_crs(epsg)
                 except Exception:
                     if source_crs.is_geographic:
-                        cartopy_crs = ccrs.PlateCarree()
+                        cartopy_crs = _PLATE_CARREE
                         self.append_formatted_text("  提示: 已自动识别为WGS84地理坐标系。", italic=True)
                     else:
                         self.show_error_message("无法自动转换投影坐标系。请使用标准EPSG代码的Shapefile。")
@@ -602,72 +1420,117 @@ class GeospatialTool(QMainWindow):
                 self.show_error_message("Shapefile缺少有效的或可识别的坐标参考系统(CRS)，无法绘图。")
                 return
 
-            ax: GeoAxes = self.figure.add_subplot(1, 1, 1, projection=ccrs.Mercator())
+            ax: GeoAxes = self.figure.add_subplot(1, 1, 1, projection=_MERCATOR)
             ax._autoscaleXon = False
             ax._autoscaleYon = False
             minx, miny, maxx, maxy = gdf.total_bounds
             ax.set_extent([minx, maxx, miny, maxy], crs=cartopy_crs)
-            ax.coastlines()
+            ax.add_feature(_COASTLINES)
             ax.gridlines(draw_labels=True, linestyle='--', color='gray', alpha=0.5)
-            gdf.plot(ax=ax, edgecolor='#333333', facecolor='#0078d7', alpha=0.6, transform=cartopy_crs)
+            # Mercator sends the poles to infinity, so clip to its latitudes first (in degrees,
+            # as Cartopy's per-geometry project_geometry did)
+            geographic = gdf.geometry if source_crs.is_geographic else gdf.geometry.to_crs(epsg=4326)
+            lat_min, lat_max = MERCATOR_LATITUDES
+            if geographic.total_bounds[1] < lat_min or geographic.total_bounds[3] > lat_max:
+                geographic = geographic.clip_by_rect(-180, lat_min, 180, lat_max)
+                geographic = geographic[~geographic.is_empty]
+            # Reproject all geometries in one vectorised pyproj call, then draw them in map coordinates
+            gdf_proj = geographic.to_crs(ax.projection)
+            gdf_proj.plot(ax=ax, edgecolor='#333333', facecolor='#0078d7', alpha=0.6)
             ax.set_title("Shapefile 可视化", pad=20)
             
-            self.canvas.draw()
+            self.canvas.draw_idle()
         except Exception as e:
             self.show_error_message(f"绘制SHP文件出错: {e}")
             self.clear_plot()
 
     def navigate_dim_prev(self):
         nav_dim = self.current_plot_info.get('nav_dim')
-        if nav_dim:
+        if nav_dim and self.current_plot_info['index_map'][nav_dim] > 0:
             self.current_plot_info['index_map'][nav_dim] -= 1
-            self.update_high_dim_plot()
+            self.schedule_frame()
 
     def navigate_dim_next(self):
         nav_dim = self.current_plot_info.get('nav_dim')
-        if nav_dim:
+        if nav_dim and self.current_plot_info['index_map'][nav_dim] < self.current_plot_info['nav_size'] - 1:
             self.current_plot_info['index_map'][nav_dim] += 1
-            self.update_high_dim_plot()
+            self.schedule_frame()
+
+    def schedule_frame(self):
+        """Throttles navigation: clicks while the timer runs only move the index it will draw."""
+        if not self._nav_timer.isActive():
+            self._nav_timer.start()
 
     def find_nc_coords(self, var):
-        lon, lat = None, None
-        possible_lon_names = ['lon', 'longitude', 'x']
-        possible_lat_names = ['lat', 'latitude', 'y']
-        
-        var_dims = var.dimensions
-        lon_dim_name = next((d for d in var_dims for n in possible_lon_names if n in d.lower()), None)
-        lat_dim_name = next((d for d in var_dims for n in possible_lat_names if n in d.lower()), None)
+        """
+        Returns the (lon, lat) coordinate variables of `var`, or (None, None) if not found.
 
-        if lon_dim_name and lat_dim_name:
-            lon = self.nc_dataset.variables.get(lon_dim_name, [])[:]
-            lat = self.nc_dataset.variables.get(lat_dim_name, [])[:]
-        else:
-            lon_var_name = next((v for v in self.nc_dataset.variables for n in possible_lon_names if n in v.lower()), None)
-            lat_var_name = next((v for v in self.nc_dataset.variables for n in possible_lat_names if n in v.lower()), None)
-            if lon_var_name and lat_var_name:
-                lon = self.nc_dataset.variables.get(lon_var_name, [])[:]
-                lat = self.nc_dataset.variables.get(lat_var_name, [])[:]
-        
-        if lon is not None and lat is not None and lon.ndim == 1 and lat.ndim == 1:
-            lon, lat = np.meshgrid(lon, lat)
-        return lon, lat
+        Coordinate variables named after the dimensions of `var` are preferred, otherwise any
+        variable with a longitude/latitude name. Nothing is read here: callers slice the
+        returned netCDF4 Variables themselves.
+        """
+        variables = self.nc_dataset.variables
+        lon_dims = [d for d in var.dimensions if LON_NAME_RE.search(d) and d in variables]
+        lat_dims = [d for d in var.dimensions if LAT_NAME_RE.search(d) and d in variables]
+        if lon_dims and lat_dims:
+            return variables[lon_dims[0]], variables[lat_dims[0]]
+        lon_names = [v for v in variables if LON_NAME_RE.search(v)]
+        lat_names = [v for v in variables if LAT_NAME_RE.search(v)]
+        if lon_names and lat_names:
+            return variables[lon_names[0]], variables[lat_names[0]]
+        return None, None
 
     def loadHistory(self):
         if os.path.exists(self.history_file):
             try:
                 with open(self.history_file, "r", encoding='utf-8') as file:
-                    return [line.strip() for line in file if line.strip()]
+                    lines = [line.strip() for line in file if line.strip()]
+                self._history_file_lines = len(lines)
+                # a path reopened after being dropped is appended again: keep its latest position
+                entries = list(dict.fromkeys(reversed(lines)))[::-1]
+                return collections.deque(entries, maxlen=HISTORY_MAX_ENTRIES)
             except Exception as e: print(f"Warning: Could not load history file. {e}")
-        return []
+        return collections.deque(maxlen=HISTORY_MAX_ENTRIES)
 
-    def saveHistory(self):
+    def saveHistory(self, new_entry=None):
+        """Appends `new_entry` to the history file; without an entry, rewrites the whole file."""
+        if new_entry is None:
+            self.rewrite_history()
+            return
         try:
-            with open(self.history_file, "w", encoding='utf-8') as file:
-                file.write("\n".join(self.history))
+            with open(self.history_file, "ab+") as file:
+                # files written by older versions have no trailing newline
+                file.seek(0, os.SEEK_END)
+                if file.tell() > 0:
+                    file.seek(-1, os.SEEK_END)
+                    if file.read(1) != b"\n":
+                        file.write(b"\n")
+                file.write(new_entry.encode('utf-8') + b"\n")
+            self._history_file_lines += 1
+        except Exception as e: print(f"Warning: Could not save history file. {e}")
+        if self._history_file_lines > 2 * HISTORY_MAX_ENTRIES:
+            self.rewrite_history()  # at most once every HISTORY_MAX_ENTRIES appends
+
+    def rewrite_history(self):
+        """Rewrites the history file from the in-memory list, dropping duplicates and old entries."""
+        entries = list(dict.fromkeys(self.history))
+        tmp_file = self.history_file + ".tmp"
+        try:
+            with open(tmp_file, "w", encoding='utf-8') as file:
+                file.writelines(f"{filepath}\n" for filepath in entries)
+            os.replace(tmp_file, self.history_file)  # atomic: a crash never leaves a truncated history
+            self._history_file_lines = len(entries)
         except Exception as e: print(f"Warning: Could not save history file. {e}")
 
     def closeEvent(self, event):
-        if self.nc_dataset: self.nc_dataset.close()
+        self._stop_workers()
+        for worker in self.findChildren(QThread):
+            worker.wait()  # interrupted loaders and closers still hold datasets
+        if self._history_file_lines != len(self.history):
+            self.rewrite_history()  # the file holds entries the in-memory history has dropped
+        if self.nc_dataset:
+            with self._nc_lock:
+                self.nc_dataset.close()
         event.accept()
 
     def append_formatted_text(self, text, title=False, header=False, bold=False, italic=False):
@@ -689,8 +1552,36 @@ class GeospatialTool(QMainWindow):
         cursor.insertText(text + "\n", char_format)
         self.text_edit.ensureCursorVisible()
 
-    def show_error_message(self, message):
-        QMessageBox.critical(self, "错误", message)
+    def append_html_lines(self, lines):
+        """Appends lines built with html_line to the text panel in a single insertion."""
+        self.text_edit.setUpdatesEnabled(False)
+        document = self.text_edit.document()
+        document.blockSignals(True)
+        try:
+            cursor = self.text_edit.textCursor()
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertHtml('<div style="font-family:\'Segoe UI\'; font-size:10pt; white-space:pre-wrap;">'
+                              + "".join(lines) + '</div>')
+        finally:
+            document.blockSignals(False)
+            self.text_edit.setUpdatesEnabled(True)
+        self.text_edit.ensureCursorVisible()
+
+    def show_error_message(self, message, fatal=False):
+        """
+        Reports an error. Only fatal errors raise a modal dialog; recoverable ones go to the
+        status bar, and repeats of the same message within ERROR_REPEAT_INTERVAL are dropped
+        so an error storm during navigation doesn't flood the UI.
+        """
+        now = time.monotonic()
+        last_message, last_time = self._last_error
+        if not fatal and message == last_message and now - last_time < ERROR_REPEAT_INTERVAL:
+            return
+        self._last_error = (message, now)
+        if fatal:
+            QMessageBox.critical(self, "错误", message)
+        else:
+            self.statusBar().showMessage(f"错误: {message}", 5000)
         self.append_formatted_text(f"错误: {message}", italic=True)
 
 